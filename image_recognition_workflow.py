@@ -1,13 +1,50 @@
-import base64
+try:
+    # SIMD-accelerated base64 (AVX2/NEON via libbase64), drop-in for stdlib
+    import pybase64 as base64
+except ImportError:
+    import base64
 import json
+try:
+    # Rust-backed JSON parser, ~5x faster than stdlib on API responses
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import diskcache
+except ImportError:
+    diskcache = None
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, Optional, Tuple
 from PIL import Image
+import hashlib
 import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 
-@dataclass
+# Static portion of the tour-guide prompt, built once at import time;
+# only the location context varies per request
+VISTA_PROMPT_TEMPLATE = """You are VISTA, an enthusiastic and knowledgeable tour guide. Analyze this image and provide a detailed, engaging description of the building or landmark shown.
+
+{location_context}
+
+Please provide:
+1. A vivid description of the building/landmark in the image
+4. Any interesting facts or recommendations for visitors
+5. Safety tips or practical advice if relevant (If no then don't mention it)
+
+Write all of the above in a single paragraph, make it short and concise.
+
+Do not include the location context provided by the user in your response. The location context will be close but might not be exactly accurate.
+
+You should first identify what's in the image and then look for the building/landmark in the image. The building/landmark will be very close to the location provided.
+
+Keep the tone friendly and informative, as if you're speaking to a curious tourist. Focus on what makes this place special and worth visiting."""
+
+@dataclass(frozen=True, slots=True)
 class LocationData:
     """Data class for location information"""
     latitude: float
@@ -15,6 +52,18 @@ class LocationData:
     address: Optional[str] = None
     landmark: Optional[str] = None
 
+def _bucket_location(location: LocationData, precision: int = 4) -> LocationData:
+    """
+    Round coordinates to ~11 m buckets so GPS jitter between shots of the
+    same spot maps to the same cache key
+    """
+    return LocationData(
+        latitude=round(location.latitude, precision),
+        longitude=round(location.longitude, precision),
+        address=location.address,
+        landmark=location.landmark
+    )
+
 class ImageRecognitionWorkflow:
     """
     Image Recognition Workflow using Qianwen AI
@@ -23,13 +72,14 @@ class ImageRecognitionWorkflow:
     to generate descriptive text about buildings and landmarks.
     """
     
-    def __init__(self, api_key: str, api_endpoint: str = None):
+    def __init__(self, api_key: str, api_endpoint: str = None, cache_dir: str = ".vista_cache"):
         """
         Initialize the workflow with API credentials
-        
+
         Args:
             api_key: Qianwen AI API key
             api_endpoint: Optional custom API endpoint
+            cache_dir: Directory for the on-disk description cache
         """
         self.api_key = api_key
         self.api_endpoint = api_endpoint or "https://dashscope.aliyuncs.com/api/v1/services/aigc/multimodal-generation/generation"
@@ -37,6 +87,25 @@ class ImageRecognitionWorkflow:
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
+
+        # Persistent session so repeated calls reuse the same TLS connection
+        # instead of paying a fresh handshake per request
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504]
+            )
+        )
+        self.session.mount('https://', adapter)
+
+        # Optional on-disk cache so identical image + location pairs don't
+        # repeat the API call (tour groups photograph the same landmarks)
+        self.cache = diskcache.Cache(cache_dir) if diskcache is not None else None
     
     def preprocess_image(self, image_path: str, max_size: Tuple[int, int] = (1024, 1024)) -> str:
         """
@@ -49,24 +118,31 @@ class ImageRecognitionWorkflow:
         Returns:
             Base64 encoded image string
         """
-        try:
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize if image is too large
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
-                
-                # Convert to base64
-                buffer = io.BytesIO()
-                img.save(buffer, format='JPEG', quality=85)
-                image_bytes = buffer.getvalue()
-                
-                return base64.b64encode(image_bytes).decode('utf-8')
-                
-        except Exception as e:
-            raise Exception(f"Error preprocessing image: {str(e)}")
+        with Image.open(image_path) as img:
+            # Already a within-bounds RGB JPEG: reuse the original bytes
+            # and skip the decode / resize / re-encode round trip entirely
+            if (img.format == 'JPEG' and img.mode == 'RGB'
+                    and img.width <= max_size[0] and img.height <= max_size[1]):
+                with open(image_path, 'rb') as f:
+                    return base64.b64encode(f.read()).decode('ascii')
+
+            # Ask libjpeg to decode at a reduced scale (no-op for non-JPEG)
+            # so large camera photos are never fully materialized
+            img.draft('RGB', max_size)
+
+            # Convert to RGB if necessary (draft usually yields RGB already)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            # Resize if image is too large
+            img.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+            # Convert to base64, encoding straight from the buffer's
+            # memoryview so the JPEG bytes are never copied
+            buffer = io.BytesIO()
+            img.save(buffer, format='JPEG', quality=85)
+
+            return base64.b64encode(buffer.getbuffer()).decode('ascii')
     
     def get_location_context(self, location: LocationData) -> str:
         """
@@ -78,16 +154,17 @@ class ImageRecognitionWorkflow:
         Returns:
             Formatted location context string
         """
-        context = f"Location coordinates: {location.latitude}, {location.longitude}"
-        
+        parts = [f"Location coordinates: {location.latitude}, {location.longitude}"]
+
         if location.address:
-            context += f"\nAddress: {location.address}"
-        
+            parts.append(f"Address: {location.address}")
+
         if location.landmark:
-            context += f"\nNearby landmark: {location.landmark}"
-            
-        return context
+            parts.append(f"Nearby landmark: {location.landmark}")
+
+        return "\n".join(parts)
     
+    @lru_cache(maxsize=128)
     def create_prompt(self, location: LocationData) -> str:
         """
         Create the prompt for Qianwen AI
@@ -99,27 +176,8 @@ class ImageRecognitionWorkflow:
             Formatted prompt string
         """
         location_context = self.get_location_context(location)
-        
-        prompt = f"""
-        You are VISTA, an enthusiastic and knowledgeable tour guide. Analyze this image and provide a detailed, engaging description of the building or landmark shown.
-        
-        {location_context}
-        
-        Please provide:
-        1. A vivid description of the building/landmark in the image
-        4. Any interesting facts or recommendations for visitors
-        5. Safety tips or practical advice if relevant (If no then don't mention it)
-
-        Write all of the above in a single paragraph, make it short and concise.
-
-        Do not include the location context provided by the user in your response. The location context will be close but might not be exactly accurate. 
-        
-        You should first identify what's in the image and then look for the building/landmark in the image. The building/landmark will be very close to the location provided.
 
-        Keep the tone friendly and informative, as if you're speaking to a curious tourist. Focus on what makes this place special and worth visiting.
-        """
-        
-        return prompt.strip()
+        return VISTA_PROMPT_TEMPLATE.format(location_context=location_context)
     
     def call_qianwen_api(self, image_base64: str, prompt: str) -> Dict[str, Any]:
         """
@@ -155,21 +213,24 @@ class ImageRecognitionWorkflow:
             }
         }
         
-        try:
-            response = requests.post(
-                self.api_endpoint,
-                headers=self.headers,
-                json=payload,
-                timeout=60
-            )
-            
-            response.raise_for_status()
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"API request failed: {str(e)}")
-        except json.JSONDecodeError as e:
-            raise Exception(f"Failed to parse API response: {str(e)}")
+        # Serialize the body ourselves (orjson when available) instead of
+        # letting requests run stdlib json.dumps on the large base64 payload;
+        # the session headers already declare application/json
+        if orjson is not None:
+            body = orjson.dumps(payload)
+        else:
+            body = json.dumps(payload).encode('utf-8')
+
+        response = self.session.post(
+            self.api_endpoint,
+            data=body,
+            timeout=(5, 60)
+        )
+
+        response.raise_for_status()
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
     
     def extract_description(self, api_response: Dict[str, Any]) -> str:
         """
@@ -208,12 +269,12 @@ class ImageRecognitionWorkflow:
             
             return content.strip()
             
-        except (KeyError, IndexError) as e:
-            raise Exception(f"Failed to extract description from response: {str(e)}")
-            
-        except Exception as e:
-            print("Raw API response:", json.dumps(api_response, indent=2))
-            raise Exception(f"Unexpected error processing API response: {str(e)}")
+        except (KeyError, IndexError):
+            raise
+
+        except Exception:
+            print("Raw API response:", api_response)
+            raise
     
     def process_image(self, image_path: str, location: LocationData) -> str:
         """
@@ -227,6 +288,17 @@ class ImageRecognitionWorkflow:
             Generated description text
         """
         try:
+            # Step 0: Check the description cache
+            cache_key = None
+            if self.cache is not None:
+                with open(image_path, 'rb') as f:
+                    image_hash = hashlib.sha256(f.read()).hexdigest()
+                cache_key = (image_hash, _bucket_location(location))
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    print("Using cached description...")
+                    return cached
+
             # Step 1: Preprocess the image
             print("Preprocessing image...")
             image_base64 = self.preprocess_image(image_path)
@@ -242,13 +314,38 @@ class ImageRecognitionWorkflow:
             # Step 4: Extract and return description
             print("Extracting description...")
             description = self.extract_description(api_response)
-            
+
+            # Step 5: Cache the result for repeat requests
+            if cache_key is not None:
+                self.cache.set(cache_key, description)
+
             return description
             
         except Exception as e:
             print(f"Error in workflow: {str(e)}")
             raise
 
+    def process_images(self, image_locations: list, max_workers: int = 8) -> list:
+        """
+        Process multiple images concurrently
+
+        The Qianwen API calls are network-bound, so running them in a
+        thread pool overlaps their latency instead of paying it serially.
+        The shared session's connection pool is reused across threads.
+
+        Args:
+            image_locations: List of (image_path, LocationData) tuples
+            max_workers: Maximum number of concurrent API calls
+
+        Returns:
+            List of generated description texts, in input order
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(
+                lambda args: self.process_image(*args),
+                image_locations
+            ))
+
 def main():
     """
     Example usage of the ImageRecognitionWorkflow